@@ -1,152 +1,318 @@
+import functools
 import streamlit as st
 import hashlib
+import hmac
 import json
 import os
-from datetime import datetime, timedelta
+import secrets
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Dict, Optional, Tuple
-import uuid
+
+# orjson is considerably faster than stdlib json; it is used for the
+# password-record column and the legacy-file import. Fall back to the
+# stdlib if it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Dict:
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(data: bytes) -> Dict:
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
 
 class AuthManager:
-    def __init__(self):
+    PBKDF2_ITERATIONS = 200_000
+
+    # How long a positive validate_session result may be served from
+    # memory before the next check hits SQLite again
+    SESSION_CACHE_TTL = 120.0
+    SESSION_CACHE_MAX = 10_000
+
+    USER_COLUMNS = ("username", "password", "role", "full_name",
+                    "client_id", "created_at", "last_login")
+
+    def __init__(self, db_path: str = "auth.db"):
+        self.db_path = db_path
+        # Legacy JSON stores, imported once into SQLite if present
         self.users_file = "users.json"
         self.sessions_file = "sessions.json"
-        self.ensure_files_exist()
-    
-    def ensure_files_exist(self):
-        """Ensure user and session files exist"""
-        if not os.path.exists(self.users_file):
-            self.save_users({})
-        if not os.path.exists(self.sessions_file):
-            self.save_sessions({})
-    
-    def load_users(self) -> Dict:
-        """Load users from JSON file"""
+        self._lock = threading.Lock()
+        # sid -> (username, cache_valid_until); single dict ops are
+        # GIL-atomic, so the hot read path needs no lock
+        self._session_cache: Dict[str, Tuple[str, float]] = {}
+        # check_same_thread=False: Streamlit reruns arrive on different
+        # script-runner threads; the lock serializes statements and WAL
+        # lets concurrent readers proceed during writes.
+        self._db = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        self._migrate_legacy_json()
+
+    def _init_schema(self):
+        """Create the users/sessions tables if missing"""
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "  username TEXT PRIMARY KEY,"
+                "  password TEXT NOT NULL,"
+                "  role TEXT NOT NULL,"
+                "  full_name TEXT,"
+                "  client_id TEXT,"
+                "  created_at TEXT,"
+                "  last_login TEXT)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "  sid TEXT PRIMARY KEY,"
+                "  username TEXT NOT NULL,"
+                "  created_at TEXT,"
+                "  expires_epoch REAL NOT NULL)"
+            )
+
+    def _read_json_file(self, path: str) -> Dict:
+        """Read a legacy JSON file from disk, returning {} on any error"""
         try:
-            with open(self.users_file, 'r') as f:
-                return json.load(f)
+            with open(path, 'rb') as f:
+                return _json_loads(f.read())
         except:
             return {}
-    
-    def save_users(self, users: Dict):
-        """Save users to JSON file"""
-        with open(self.users_file, 'w') as f:
-            json.dump(users, f, indent=2)
-    
-    def load_sessions(self) -> Dict:
-        """Load sessions from JSON file"""
+
+    def _migrate_legacy_json(self):
+        """One-time import of the old users.json/sessions.json stores"""
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+                return
+            for username, user in self._read_json_file(self.users_file).items():
+                password = user.get("password", "")
+                if isinstance(password, dict):
+                    password = _json_dumps(password).decode()
+                self._db.execute(
+                    "INSERT OR IGNORE INTO users VALUES (?,?,?,?,?,?,?)",
+                    (username, password, user.get("role", ""),
+                     user.get("full_name", username.title()),
+                     user.get("client_id", ""), user.get("created_at", ""),
+                     user.get("last_login", ""))
+                )
+            for sid, session in self._read_json_file(self.sessions_file).items():
+                self._db.execute(
+                    "INSERT OR IGNORE INTO sessions VALUES (?,?,?,?)",
+                    (sid, session.get("username", ""),
+                     session.get("created_at", ""),
+                     self._expiry_epoch(session))
+                )
+
+    @staticmethod
+    def _expiry_epoch(session: Dict) -> float:
+        """Expiry time of a session record as a UNIX timestamp"""
+        epoch = session.get("expires_epoch")
+        if epoch is not None:
+            return epoch
         try:
-            with open(self.sessions_file, 'r') as f:
-                return json.load(f)
+            return datetime.fromisoformat(session["expires_at"]).timestamp()
         except:
-            return {}
-    
-    def save_sessions(self, sessions: Dict):
-        """Save sessions to JSON file"""
-        with open(self.sessions_file, 'w') as f:
-            json.dump(sessions, f, indent=2)
-    
-    def hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
-    
-    def generate_client_id(self, username: str, role: str) -> str:
-        """Generate client ID based on username and role"""
-        timestamp = datetime.now().strftime("%Y%m%d")
+            return 0.0
+
+    def _user_row_to_dict(self, row) -> Dict:
+        """Materialize a users row as the dict shape callers expect"""
+        user = dict(zip(self.USER_COLUMNS, row))
+        password = user["password"]
+        if password.startswith("{"):
+            user["password"] = _json_loads(password.encode())
+        return user
+
+    def hash_password(self, password: str, salt: Optional[str] = None) -> Dict:
+        """Hash password with PBKDF2-HMAC-SHA256 and a per-user random salt"""
+        if salt is None:
+            salt = os.urandom(16).hex()
+        digest = hashlib.pbkdf2_hmac(
+            'sha256', password.encode(), bytes.fromhex(salt), self.PBKDF2_ITERATIONS
+        )
+        return {"salt": salt, "hash": digest.hex()}
+
+    def verify_password(self, password: str, stored) -> bool:
+        """Verify a password against a stored record.
+
+        Accepts both the current salted dict format and the legacy
+        unsalted SHA-256 hex string for users created before the switch.
+        """
+        if isinstance(stored, str):
+            # Legacy unsalted SHA-256 record
+            computed = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(computed, stored)
+        computed = self.hash_password(password, stored["salt"])["hash"]
+        return hmac.compare_digest(computed, stored["hash"])
+
+    def hash_passwords_bulk(self, credentials: Dict[str, str]) -> Dict[str, Dict]:
+        """Hash many passwords in parallel for bulk registration/import.
+
+        pbkdf2_hmac releases the GIL inside OpenSSL, so a thread pool
+        scales near-linearly across cores instead of paying 200k rounds
+        per user serially.
+        """
+        usernames = list(credentials)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            hashes = executor.map(self.hash_password, (credentials[u] for u in usernames))
+            return dict(zip(usernames, hashes))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _client_id(username: str, role: str, day: str) -> str:
+        """Derive a client ID; memoized so rerun-driven retries skip the hash"""
         role_prefix = "INV" if role == "investor" else "IVE"  # INV for investor, IVE for investee
-        username_hash = hashlib.md5(username.encode()).hexdigest()[:6].upper()
-        return f"{role_prefix}_{username_hash}_{timestamp}"
-    
-    def register_user(self, username: str, password: str, role: str) -> Tuple[bool, str, str]:
-        """Register a new user and return success status, message, and session_id"""
-        users = self.load_users()
-        
-        if username in users:
-            return False, "Username already exists", ""
-        
+        username_hash = hashlib.sha256(username.encode()).hexdigest()[:6].upper()
+        return f"{role_prefix}_{username_hash}_{day}"
+
+    def generate_client_id(self, username: str, role: str, now: Optional[datetime] = None) -> str:
+        """Generate client ID based on username and role"""
+        timestamp = (now or datetime.now()).strftime("%Y%m%d")
+        return self._client_id(username, role, timestamp)
+
+    def register_user(self, username: str, password: str, role: str) -> Tuple[bool, str, str, Optional[Dict]]:
+        """Register a new user and return success status, message,
+        session_id, and the created user record (for direct auto-login)"""
         if not username or not password:
-            return False, "Username and password are required", ""
-        
+            return False, "Username and password are required", "", None
+
         if role not in ["investor", "investee"]:
-            return False, "Invalid role selected", ""
-        
-        client_id = self.generate_client_id(username, role)
-        
-        users[username] = {
-            "password": self.hash_password(password),
+            return False, "Invalid role selected", "", None
+
+        # Read the clock once and reuse it for every timestamp in this op
+        now = datetime.now()
+        now_iso = now.isoformat()
+        client_id = self.generate_client_id(username, role, now)
+        password_record = self.hash_password(password)
+
+        user = {
+            "username": username,
+            "password": password_record,
             "role": role,
             "full_name": username.title(),  # Use username as display name
             "client_id": client_id,
-            "created_at": datetime.now().isoformat(),
-            "last_login": datetime.now().isoformat()
+            "created_at": now_iso,
+            "last_login": now_iso
         }
-        
-        self.save_users(users)
-        
+
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT INTO users VALUES (?,?,?,?,?,?,?)",
+                    (username, _json_dumps(password_record).decode(), role,
+                     user["full_name"], client_id, now_iso, now_iso)
+                )
+            except sqlite3.IntegrityError:
+                return False, "Username already exists", "", None
+
         # Automatically create session for new user
-        session_id = self.create_session(username)
-        
-        return True, f"User registered successfully! Client ID: {client_id}", session_id
-    
+        session_id = self.create_session(username, now)
+
+        return True, f"User registered successfully! Client ID: {client_id}", session_id, user
+
     def authenticate_user(self, username: str, password: str) -> Tuple[bool, Optional[Dict]]:
         """Authenticate user credentials"""
-        users = self.load_users()
-        
-        if username not in users:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM users WHERE username=?", (username,)
+            ).fetchone()
+
+        if row is None:
             return False, None
-        
-        user = users[username]
-        if user["password"] == self.hash_password(password):
-            # Update last login
-            user["last_login"] = datetime.now().isoformat()
-            users[username] = user
-            self.save_users(users)
+
+        user = self._user_row_to_dict(row)
+        if self.verify_password(password, user["password"]):
+            # Update last login, but skip the write if it already moved
+            # within the last minute (rerun bursts replay this path)
+            now = datetime.now()
+            try:
+                last_login = datetime.fromisoformat(user["last_login"])
+            except (TypeError, ValueError):
+                last_login = None
+            if last_login is None or (now - last_login).total_seconds() >= 60:
+                user["last_login"] = now.isoformat()
+                with self._lock:
+                    self._db.execute(
+                        "UPDATE users SET last_login=? WHERE username=?",
+                        (user["last_login"], username)
+                    )
             return True, user
-        
+
         return False, None
-    
-    def create_session(self, username: str) -> str:
+
+    def create_session(self, username: str, now: Optional[datetime] = None) -> str:
         """Create a new session for authenticated user"""
-        session_id = str(uuid.uuid4())
-        sessions = self.load_sessions()
-        
-        sessions[session_id] = {
-            "username": username,
-            "created_at": datetime.now().isoformat(),
-            "expires_at": (datetime.now() + timedelta(hours=24)).isoformat()
-        }
-        
-        self.save_sessions(sessions)
+        session_id = secrets.token_urlsafe(16)
+        if now is None:
+            now = datetime.now()
+
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sessions VALUES (?,?,?,?)",
+                (session_id, username, now.isoformat(), now.timestamp() + 86400)
+            )
+            # Opportunistically purge anything already expired; an index
+            # hit per login instead of a sweep on the validate path.
+            self._db.execute(
+                "DELETE FROM sessions WHERE expires_epoch<=?", (time.time(),)
+            )
         return session_id
-    
+
     def validate_session(self, session_id: str) -> Tuple[bool, Optional[str]]:
         """Validate session and return username if valid"""
-        sessions = self.load_sessions()
-        
-        if session_id not in sessions:
-            return False, None
-        
-        session = sessions[session_id]
-        expires_at = datetime.fromisoformat(session["expires_at"])
-        
-        if datetime.now() > expires_at:
-            # Session expired, remove it
-            del sessions[session_id]
-            self.save_sessions(sessions)
+        now = time.time()
+        cached = self._session_cache.get(session_id)
+        if cached is not None and now < cached[1]:
+            return True, cached[0]
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT username, expires_epoch FROM sessions"
+                " WHERE sid=? AND expires_epoch>?",
+                (session_id, now)
+            ).fetchone()
+
+        if row is None:
+            self._session_cache.pop(session_id, None)
             return False, None
-        
-        return True, session["username"]
-    
+
+        # Cache through the TTL, but never past the session's own expiry
+        if len(self._session_cache) >= self.SESSION_CACHE_MAX:
+            self._session_cache.clear()
+        self._session_cache[session_id] = (
+            row[0], min(now + self.SESSION_CACHE_TTL, row[1])
+        )
+        return True, row[0]
+
     def logout_user(self, session_id: str):
         """Logout user by removing session"""
-        sessions = self.load_sessions()
-        if session_id in sessions:
-            del sessions[session_id]
-            self.save_sessions(sessions)
-    
+        self._session_cache.pop(session_id, None)
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE sid=?", (session_id,))
+
     def get_user_info(self, username: str) -> Optional[Dict]:
         """Get user information"""
-        users = self.load_users()
-        return users.get(username)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM users WHERE username=?", (username,)
+            ).fetchone()
+        return self._user_row_to_dict(row) if row else None
+
+
+@st.cache_resource
+def _auth_manager() -> AuthManager:
+    """Process-wide AuthManager shared by every Streamlit session"""
+    return AuthManager()
 
 def show_login_page():
     """Display login/register page"""
@@ -155,10 +321,11 @@ def show_login_page():
         page_icon="🔐",
         layout="centered"
     )
-    
-    # Initialize auth manager
+
+    # Initialize auth manager (one shared instance + DB connection for
+    # the whole process, not one per browser session)
     if 'auth_manager' not in st.session_state:
-        st.session_state.auth_manager = AuthManager()
+        st.session_state.auth_manager = _auth_manager()
     
     auth = st.session_state.auth_manager
     
@@ -227,19 +394,18 @@ def show_login_page():
                 elif len(reg_password) < 6:
                     st.error("❌ Password must be at least 6 characters long")
                 else:
-                    success, message, session_id = auth.register_user(reg_username, reg_password, reg_role)
+                    success, message, session_id, user_info = auth.register_user(reg_username, reg_password, reg_role)
                     if success:
                         st.success(f"✅ {message}")
-                        # Auto-login after successful registration
+                        # Auto-login after successful registration; the
+                        # user record is already in hand, no need to
+                        # re-run authentication (and its PBKDF2 rounds)
                         if session_id:
-                            # Get user info for session
-                            success_auth, user_info = auth.authenticate_user(reg_username, reg_password)
-                            if success_auth:
-                                st.session_state.session_id = session_id
-                                st.session_state.current_user = user_info
-                                st.session_state.authenticated = True
-                                st.success("🎉 Welcome! You're now logged in!")
-                                st.rerun()
+                            st.session_state.session_id = session_id
+                            st.session_state.current_user = user_info
+                            st.session_state.authenticated = True
+                            st.success("🎉 Welcome! You're now logged in!")
+                            st.rerun()
                     else:
                         st.error(f"❌ {message}")
     
@@ -255,27 +421,45 @@ def show_login_page():
         unsafe_allow_html=True
     )
 
+def invalidate_session_cache():
+    """Drop the memoized auth result so the next check hits the store"""
+    for key in ('_auth_ok', '_auth_fingerprint'):
+        if key in st.session_state:
+            del st.session_state[key]
+
 def check_authentication():
     """Check if user is authenticated"""
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
-    
+
     if not st.session_state.authenticated:
         return False
-    
+
     # Validate session if exists
     if 'session_id' in st.session_state and 'auth_manager' in st.session_state:
+        session_id = st.session_state.session_id
+        # Memoize the validated session so widget-interaction reruns
+        # skip the store lookup; revalidate only when the session id
+        # changes (login/logout) or the cache is invalidated.
+        if (st.session_state.get('_auth_ok')
+                and st.session_state.get('_auth_fingerprint') == session_id):
+            return True
+
         auth = st.session_state.auth_manager
-        valid, username = auth.validate_session(st.session_state.session_id)
+        valid, username = auth.validate_session(session_id)
         if not valid:
             # Session expired
             st.session_state.authenticated = False
+            invalidate_session_cache()
             if 'current_user' in st.session_state:
                 del st.session_state.current_user
             if 'session_id' in st.session_state:
                 del st.session_state.session_id
             return False
-    
+
+        st.session_state._auth_ok = True
+        st.session_state._auth_fingerprint = session_id
+
     return True
 
 def logout_user():
@@ -283,6 +467,7 @@ def logout_user():
     if 'session_id' in st.session_state and 'auth_manager' in st.session_state:
         auth = st.session_state.auth_manager
         auth.logout_user(st.session_state.session_id)
+    invalidate_session_cache()
     
     # Clear session state
     keys_to_remove = ['authenticated', 'current_user', 'session_id', 'last_session_id']
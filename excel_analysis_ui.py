@@ -1,17 +1,14 @@
 import streamlit as st
 import requests
+import sys
+from urllib3.util.retry import Retry
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 import pandas as pd
-from datetime import datetime
-import io
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
 from auth import check_authentication, show_login_page, logout_user, get_current_user, get_current_client_id
-from s3_data_visualizer import S3DataVisualizer
+from frame_utils import joined_rows, to_csv
 import os
 from dotenv import load_dotenv
 
@@ -29,83 +26,277 @@ st.set_page_config(
 # API Configuration
 API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:8006')
 
+# orjson decodes large dashboard payloads several times faster than the
+# stdlib; fall back to json when it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
 class ExcelAnalysisAPI:
+    # Part size for direct-to-S3 multipart uploads
+    UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
     def __init__(self, base_url: str):
         self.base_url = base_url
-        
-    def health_check(self) -> Dict:
-        """Check API health status"""
+        # One pooled session with HTTP keep-alive: repeated calls reuse
+        # the TCP connection instead of paying a handshake per request.
+        self.session = requests.Session()
+        # GET only: a gateway 502/504 can arrive while the backend is
+        # still working, and replaying a POST would start a duplicate
+        # upload or analysis
+        retries = Retry(total=3, backoff_factor=0.3,
+                        status_forcelist=[502, 503, 504],
+                        allowed_methods=['GET'])
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10, pool_maxsize=20, max_retries=retries
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Whether the backend has /status-bundle; unknown until probed
+        self._has_status_bundle: Optional[bool] = None
+
+    def _call(self, method: str, path: str, timeout: Optional[float] = 30, **kwargs) -> Dict:
+        """Issue one API request with shared retry/timeout/error handling"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=10)
+            response = self.session.request(
+                method, f"{self.base_url}{path}", timeout=timeout, **kwargs
+            )
             return {
                 "status": "success" if response.status_code == 200 else "error",
                 "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else response.text
+                "data": _json_loads(response.content) if response.status_code == 200 else response.text
             }
         except requests.exceptions.RequestException as e:
             return {"status": "error", "error": str(e)}
-    
+
+    def health_check(self) -> Dict:
+        """Check API health status"""
+        return self._call('GET', '/health', timeout=10)
+
     def test_s3_connection(self) -> Dict:
         """Test S3 connection"""
+        return self._call('GET', '/test-s3')
+
+    def combined_status(self) -> Dict:
+        """Fetch API health and S3 status in one roundtrip.
+
+        Tries the batched /status-bundle endpoint first; when the
+        backend doesn't have it, that's remembered on the client so
+        later clicks skip straight to firing both legacy checks
+        concurrently — one latency, no wasted probe. Always returns
+        {"health": ..., "s3": ...}.
+        """
+        if self._has_status_bundle is not False:
+            bundle = self._call('GET', '/status-bundle',
+                                params={'checks': 'health,s3'}, timeout=10)
+            if bundle["status"] == "success" and isinstance(bundle.get("data"), dict):
+                data = bundle["data"]
+                if "health" in data and "s3" in data:
+                    self._has_status_bundle = True
+                    return {
+                        "health": {"status": "success", "status_code": 200,
+                                   "data": data["health"]},
+                        "s3": {"status": "success", "status_code": 200,
+                               "data": data["s3"]},
+                    }
+            self._has_status_bundle = False
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            health_future = executor.submit(self.health_check)
+            s3_future = executor.submit(self.test_s3_connection)
+            return {"health": health_future.result(), "s3": s3_future.result()}
+
+    def upload_and_analyze(self, client_id: str, files: list) -> Dict:
+        """Upload Excel files and start analysis"""
+        # Pass the UploadedFile objects themselves so urllib3 streams
+        # them in chunks instead of holding a second copy of the bytes
+        files_data = []
+        for file in files:
+            file.seek(0)
+            files_data.append(('files', (file.name, file, file.type)))
+
+        # Long read timeout: analysis may take a while, but a dead
+        # connection should not hang the UI thread forever
+        return self._call('POST', '/upload-and-analyze', timeout=600,
+                          data={'client_id': client_id}, files=files_data)
+
+    def start_upload_session(self, client_id: str, files: list) -> Dict:
+        """Ask the API for presigned part URLs for a direct-to-S3 upload"""
+        manifest = [{"name": f.name, "size": f.size} for f in files]
+        return self._call('POST', '/upload-sessions',
+                          json={"client_id": client_id, "files": manifest,
+                                "part_size": self.UPLOAD_PART_SIZE})
+
+    def upload_via_presigned(self, client_id: str, files: list) -> Optional[Dict]:
+        """Upload files straight to S3 through presigned part URLs.
+
+        File bytes never pass through the API server: parts are sliced
+        with memoryview (no copies) and PUT concurrently, then the
+        session is committed and polled until analysis starts. Returns
+        None when the backend has no upload-session support — or when
+        the path fails before S3 accepts a single part — so callers
+        can fall back to the proxied upload path.
+        """
+        session_info = self.start_upload_session(client_id, files)
+        if session_info["status"] != "success":
+            return None
+
+        data = session_info["data"]
+        file_specs = {spec["name"]: spec for spec in data.get("files", [])}
+        part_size = data.get("part_size", self.UPLOAD_PART_SIZE)
+
+        # Flipped once any part lands; decides whether a failure can
+        # still fall back to the proxied upload without duplication
+        any_part_accepted = [False]
+
+        def put_part(url_and_chunk):
+            url, chunk = url_and_chunk
+            response = self.session.put(url, data=chunk, timeout=120)
+            response.raise_for_status()
+            any_part_accepted[0] = True
+
         try:
-            response = requests.get(f"{self.base_url}/test-s3", timeout=30)
-            return {
-                "status": "success" if response.status_code == 200 else "error",
-                "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else response.text
-            }
+            parts = []
+            for file in files:
+                spec = file_specs.get(file.name)
+                if spec is None:
+                    return None
+                buffer = memoryview(file.getbuffer())
+                for i, part_url in enumerate(spec.get("part_urls", [])):
+                    parts.append((part_url, buffer[i * part_size:(i + 1) * part_size]))
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(put_part, parts))
+
+            # Commit and poll until the server confirms the session
+            session_id = data.get("session_id", "")
+            deadline = time.time() + 300
+            while time.time() < deadline:
+                response = self.session.post(
+                    f"{self.base_url}/upload-sessions/{session_id}/commit",
+                    timeout=30
+                )
+                if response.status_code != 200:
+                    return {"status": "error", "status_code": response.status_code,
+                            "data": response.text}
+                result = _json_loads(response.content)
+                if result.get("state", "committed") == "committed":
+                    return {"status": "success", "status_code": 200, "data": result}
+                time.sleep(2)
+            return {"status": "error", "error": "Upload session commit timed out"}
         except requests.exceptions.RequestException as e:
+            if not any_part_accepted[0]:
+                # Nothing reached S3 yet, so the proxied path can
+                # safely take over without risking a duplicate upload
+                return None
             return {"status": "error", "error": str(e)}
-    
-    def upload_and_analyze(self, client_id: str, files: list) -> Dict:
-        """Upload Excel files and start analysis"""
+
+    def upload_and_analyze_stream(self, client_id: str, files: list):
+        """Upload Excel files and yield progress events as they arrive.
+
+        With stream=True the response body is consumed as the server
+        produces it; when the backend emits newline-delimited JSON
+        progress events ({"pct": ..., "msg": ...}) each one is yielded as
+        {"status": "progress", "data": event}. The final yield always has
+        the same shape as upload_and_analyze, so it can be passed
+        straight to display_response.
+        """
         try:
-            # Prepare files for upload
+            # Prepare files for upload; pass the UploadedFile object
+            # itself so urllib3 streams it in chunks instead of holding
+            # a second full copy of the bytes
             files_data = []
             for file in files:
-                files_data.append(('files', (file.name, file.getvalue(), file.type)))
-            
+                file.seek(0)
+                files_data.append(('files', (file.name, file, file.type)))
+
             # Prepare form data
             data = {'client_id': client_id}
-            
+
             # Remove timeout to let the analysis run as long as needed
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/upload-and-analyze",
                 data=data,
-                files=files_data
+                files=files_data,
+                stream=True
             )
-            
-            return {
-                "status": "success" if response.status_code == 200 else "error",
-                "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else response.text
-            }
+
+            if response.status_code != 200:
+                yield {"status": "error", "status_code": response.status_code, "data": response.text}
+                return
+
+            content_type = response.headers.get('content-type', '')
+            if 'ndjson' in content_type or 'event-stream' in content_type:
+                last_event = None
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        event = _json_loads(line)
+                    except ValueError:
+                        continue
+                    last_event = event
+                    yield {"status": "progress", "data": event}
+                yield {"status": "success", "status_code": 200, "data": last_event}
+            else:
+                yield {"status": "success", "status_code": 200, "data": _json_loads(response.content)}
         except requests.exceptions.RequestException as e:
-            return {"status": "error", "error": str(e)}
-    
+            yield {"status": "error", "error": str(e)}
+
     def get_analysis_status(self, session_id: str) -> Dict:
         """Get analysis status by session ID"""
-        try:
-            response = requests.get(f"{self.base_url}/status/{session_id}", timeout=30)
-            return {
-                "status": "success" if response.status_code == 200 else "error",
-                "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else response.text
-            }
-        except requests.exceptions.RequestException as e:
-            return {"status": "error", "error": str(e)}
-    
+        return self._call('GET', f'/status/{session_id}')
+
     def get_client_dashboard(self, client_id: str) -> Dict:
         """Get client dashboard data"""
-        try:
-            response = requests.get(f"{self.base_url}/dashboard/{client_id}", timeout=30)
-            return {
-                "status": "success" if response.status_code == 200 else "error",
-                "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else response.text
-            }
-        except requests.exceptions.RequestException as e:
-            return {"status": "error", "error": str(e)}
+        return self._call('GET', f'/dashboard/{client_id}')
+
+@st.cache_resource
+def get_api_client() -> 'ExcelAnalysisAPI':
+    """Process-wide API client: one connection pool shared by every
+    session, so keep-alive connections survive across reruns and users"""
+    return ExcelAnalysisAPI(API_BASE_URL)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_dashboard(base_url: str, client_id: str) -> Dict:
+    """Fetch dashboard data, cached so reruns within the TTL skip the API"""
+    return get_api_client().get_client_dashboard(client_id)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def group_by_client(keys: tuple, _viz) -> Dict[str, List[str]]:
+    """Group S3 object keys by client ID (one cached pass per listing)"""
+    groups: Dict[str, List[str]] = {}
+    for key in keys:
+        groups.setdefault(_viz.extract_client_id_from_key(key), []).append(key)
+    return groups
+
+@st.cache_data(show_spinner=False)
+def _partition_summary(items: tuple) -> tuple:
+    """Split summary stats into (numeric, other), cached per payload"""
+    numeric = {k: v for k, v in items if isinstance(v, (int, float))}
+    other = {k: v for k, v in items if not isinstance(v, (int, float))}
+    return numeric, other
+
+@st.cache_data(show_spinner=False)
+def _report_type_counts(reports: List[Dict]) -> Dict[str, int]:
+    """Count reports per type, long tail collapsed, cached per payload"""
+    counts: Dict[str, int] = {}
+    for report in reports:
+        if isinstance(report, dict):
+            report_type = report.get('type', report.get('category', 'General'))
+            counts[report_type] = counts.get(report_type, 0) + 1
+
+    # Collapse the long tail so the pie stays readable and cheap
+    if len(counts) > 12:
+        ranked = sorted(counts.items(), key=lambda kv: -kv[1])
+        counts = dict(ranked[:11])
+        counts['Other'] = sum(count for _, count in ranked[11:])
+    return counts
 
 def display_response(response_data: Dict, title: str = "Response"):
     """Display API response in a formatted way"""
@@ -165,9 +356,42 @@ def display_response(response_data: Dict, title: str = "Response"):
         if "data" in response_data:
             st.code(str(response_data["data"]))
 
+@st.fragment(run_every=10)
+def auto_refresh_status(api: ExcelAnalysisAPI, session_id: str, interval: float = 10.0):
+    """Poll analysis status on a timer without rerunning the whole app.
+
+    run_every drives the cadence; only this fragment reruns each tick.
+    An in-flight guard skips overlapping polls (giving up on one stuck
+    for more than 3x the interval) and redraws the previous result so
+    a skipped tick doesn't blank the panel.
+    """
+    now = time.time()
+    inflight_since = st.session_state.get('poll_inflight_since')
+    if inflight_since and now - inflight_since < 3 * interval:
+        # Previous poll still pending: a fragment rerun replaces the
+        # old output, so repaint the last result instead of nothing
+        last = st.session_state.get('last_poll_result')
+        if last is not None:
+            display_response(last, "Analysis Status (auto-refresh)")
+        return
+    st.session_state.poll_inflight_since = now
+    try:
+        result = api.get_analysis_status(session_id)
+        st.session_state.last_poll_result = result
+        display_response(result, "Analysis Status (auto-refresh)")
+    finally:
+        st.session_state.poll_inflight_since = None
+
+@st.fragment
 def create_dashboard_visualizations(dashboard_data: Dict, client_id: str, user_role: str):
     """Create comprehensive dashboard visualizations based on the data structure"""
-    
+    # Imported here so cold starts that never open a dashboard (login
+    # page, API testing tab) skip the plotly import cost
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import pyarrow as pa
+
+
     st.divider()
     st.header("📊 Interactive Dashboard")
     st.markdown(f"**Client ID:** `{client_id}` | **Role:** {user_role.title()}")
@@ -215,19 +439,16 @@ def create_dashboard_visualizations(dashboard_data: Dict, client_id: str, user_r
             if reports and isinstance(reports, list):
                 st.subheader("📊 Reports Distribution")
                 
-                # Count reports by type or status
-                report_types = {}
-                for report in reports:
-                    if isinstance(report, dict):
-                        report_type = report.get('type', report.get('category', 'General'))
-                        report_types[report_type] = report_types.get(report_type, 0) + 1
-                
+                # Count reports by type or status (cached per payload)
+                report_types = _report_type_counts(reports)
+
                 if report_types:
                     fig_pie = px.pie(
                         values=list(report_types.values()),
                         names=list(report_types.keys()),
                         title="Report Types Distribution"
                     )
+                    fig_pie.update_layout(uirevision='report-types')
                     st.plotly_chart(fig_pie, use_container_width=True)
         
         with col2:
@@ -235,16 +456,24 @@ def create_dashboard_visualizations(dashboard_data: Dict, client_id: str, user_r
             if summary_stats:
                 st.subheader("📈 Summary Statistics")
                 
-                numeric_stats = {k: v for k, v in summary_stats.items() 
-                               if isinstance(v, (int, float))}
-                
+                numeric_stats, _ = _partition_summary(
+                    tuple(sorted(summary_stats.items()))
+                )
+
                 if numeric_stats:
-                    fig_bar = px.bar(
-                        x=list(numeric_stats.keys()),
-                        y=list(numeric_stats.values()),
-                        title="Key Metrics Overview"
+                    # Cap to the 20 largest magnitudes and build a bare
+                    # go.Bar; uirevision lets Plotly reuse the canvas
+                    # across reruns instead of re-rendering from scratch
+                    ranked = sorted(numeric_stats.items(), key=lambda kv: -abs(kv[1]))[:20]
+                    fig_bar = go.Figure(go.Bar(
+                        x=[key for key, _ in ranked],
+                        y=[value for _, value in ranked]
+                    ))
+                    fig_bar.update_layout(
+                        title="Key Metrics Overview",
+                        xaxis_tickangle=-45,
+                        uirevision='summary-stats'
                     )
-                    fig_bar.update_layout(xaxis_tickangle=-45)
                     st.plotly_chart(fig_bar, use_container_width=True)
     
     with viz_tabs[1]:  # Data Tables Tab
@@ -261,26 +490,37 @@ def create_dashboard_visualizations(dashboard_data: Dict, client_id: str, user_r
                     
                     # Add search functionality
                     search_term = st.text_input("🔍 Search in reports:", placeholder="Enter search term...")
-                    
+                    search_term = search_term.strip() if search_term else ""
+
                     if search_term:
-                        # Filter DataFrame based on search term
-                        mask = df_reports.astype(str).apply(
-                            lambda x: x.str.contains(search_term, case=False, na=False)
-                        ).any(axis=1)
+                        # One vectorized substring pass over the cached
+                        # row-joined strings; regex=False takes the C
+                        # str.find path instead of compiling a pattern
+                        mask = joined_rows(df_reports).str.contains(
+                            search_term, case=False, regex=False, na=False
+                        )
                         df_reports = df_reports[mask]
                     
-                    # Display with pagination
+                    # Display with pagination: only one page worth of
+                    # rows is Arrow-serialized per rerun, not the frame
+                    page_size = 50
+                    total_pages = max(1, -(-len(df_reports) // page_size))
+                    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
+                    start = (page - 1) * page_size
+                    st.caption(
+                        f"Showing rows {start + 1}-{min(start + page_size, len(df_reports))} "
+                        f"of {len(df_reports)}"
+                    )
                     st.dataframe(
-                        df_reports,
+                        df_reports.iloc[start:start + page_size],
                         use_container_width=True,
                         height=400
                     )
                     
-                    # Download button
-                    csv = df_reports.to_csv(index=False)
+                    # Download button (CSV rendered once per frame, not per rerun)
                     st.download_button(
                         label="📥 Download Reports CSV",
-                        data=csv,
+                        data=to_csv(df_reports),
                         file_name=f"{client_id}_reports.csv",
                         mime="text/csv"
                     )
@@ -292,35 +532,117 @@ def create_dashboard_visualizations(dashboard_data: Dict, client_id: str, user_r
                 st.warning(f"Could not create reports table: {str(e)}")
                 st.json(reports)
         
-        # Summary statistics table
+        # Summary statistics table; an Arrow table goes straight over
+        # Streamlit's Arrow channel without a pandas round-trip
         if summary_stats:
             st.subheader("📈 Summary Statistics")
-            df_summary = pd.DataFrame(list(summary_stats.items()), columns=['Metric', 'Value'])
-            st.dataframe(df_summary, use_container_width=True)
-        
+            st.dataframe(
+                pa.table({'Metric': list(summary_stats.keys()),
+                          'Value': [str(value) for value in summary_stats.values()]}),
+                use_container_width=True
+            )
+
         # Analysis results table
         if analysis_results:
             st.subheader("🔍 Analysis Results")
-            df_analysis = pd.DataFrame(list(analysis_results.items()), columns=['Analysis Item', 'Result'])
-            st.dataframe(df_analysis, use_container_width=True)
+            st.dataframe(
+                pa.table({'Analysis Item': list(analysis_results.keys()),
+                          'Result': [str(value) for value in analysis_results.values()]}),
+                use_container_width=True
+            )
         
         # Raw data section
         with st.expander("🔍 Raw Dashboard Data", expanded=False):
             st.json(dashboard_data)
 
-def main():
-    # Check authentication first
-    if not check_authentication():
-        show_login_page()
-        return
-    
+@st.fragment
+def s3_explorer_fragment(s3_viz, s3_objects: List[str]):
+    """Client/file selection and visualization for the S3 explorer.
+
+    Runs as a fragment so selectbox changes and visualize clicks rerun
+    only this block instead of the whole app.
+    """
+    st.subheader(f"📁 Available Data Files ({len(s3_objects)} files)")
+
+    # Group objects by client ID (cached across reruns per listing)
+    client_groups = group_by_client(tuple(s3_objects), s3_viz)
+
+    # Client selection
+    selected_client = st.selectbox(
+        "👤 Select Client:",
+        options=list(client_groups.keys()),
+        help="Choose a client to visualize their data"
+    )
+
+    if selected_client:
+        client_files = client_groups[selected_client]
+
+        # File selection
+        selected_file = st.selectbox(
+            "📄 Select Data File:",
+            options=client_files,
+            help="Choose a specific JSON file to visualize"
+        )
+
+        if selected_file:
+            # Load and visualize button
+            if st.button("🚀 Load & Visualize Data", type="primary"):
+                with st.spinner(f"📊 Loading and analyzing {selected_file}..."):
+                    # Fetch data from S3
+                    json_data = s3_viz.fetch_json_from_s3(selected_file)
+
+                    if json_data:
+                        st.success(f"✅ Successfully loaded {selected_file}")
+
+                        # Create comprehensive dashboard
+                        s3_viz.create_comprehensive_dashboard(json_data, selected_client,
+                                                              object_key=selected_file)
+                    else:
+                        st.error("❌ Failed to load data from S3")
+
+            # Show file info
+            st.info(f"📋 **File:** `{selected_file}` | **Client:** `{selected_client}`")
+
+    # Bulk analysis option
+    st.divider()
+    st.subheader("📊 Bulk Analysis")
+
+    if st.button("📈 Analyze All Client Data", type="secondary"):
+        with st.spinner("📊 Performing bulk analysis..."):
+            # Analyze data for current user's client ID
+            user_client_files = client_groups.get(get_current_client_id(), [])
+
+            if user_client_files:
+                # Fetch all files concurrently (S3 GETs are
+                # IO-bound), then render dashboards in order
+                bulk_files = user_client_files[:3]  # Limit to 3 files
+                bulk_data = s3_viz.fetch_json_many(bulk_files)
+
+                for file, json_data in bulk_data.items():
+                    st.subheader(f"📄 Analysis: {file}")
+                    if json_data:
+                        # Create mini dashboard for each file
+                        with st.expander(f"📊 {file} Dashboard", expanded=False):
+                            s3_viz.create_comprehensive_dashboard(
+                                json_data, get_current_client_id(), object_key=file
+                            )
+            else:
+                st.warning(f"No data files found for your client ID: {get_current_client_id()}")
+
+def bootstrap():
+    """One-time per-session setup (API client lookup)"""
+    if 'api_client' not in st.session_state:
+        st.session_state.api_client = get_api_client()
+
+def render():
+    """Per-rerun widget tree; assumes bootstrap() has already run"""
     # Get current user info
     current_user = get_current_user()
     current_client_id = get_current_client_id()
-    
+
     st.title("📊 Excel Analysis Dashboard")
     st.markdown("**LLM-powered Excel analysis with maximum parallel report generation**")
-    
+
     # User info header
     col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
@@ -331,31 +653,25 @@ def main():
     with col3:
         if st.button("🚪 Logout", type="secondary"):
             logout_user()
-    
-    # Initialize API client
-    if 'api_client' not in st.session_state:
-        st.session_state.api_client = ExcelAnalysisAPI(API_BASE_URL)
-    
+
     api = st.session_state.api_client
-    
+
     # Sidebar for system status
     with st.sidebar:
         st.header("🔧 System Status")
         
-        # Health Check
-        if st.button("🏥 Health Check", type="secondary"):
-            with st.spinner("Checking API health..."):
-                health_result = api.health_check()
+        # Health + S3 diagnostics in one batched roundtrip
+        if st.button("🩺 Run Diagnostics", type="secondary"):
+            with st.spinner("Checking API health and S3..."):
+                status = api.combined_status()
+                health_result = status["health"]
                 if health_result["status"] == "success":
                     st.success("✅ API is healthy!")
                 else:
                     st.error("❌ API health check failed")
                 st.json(health_result)
-        
-        # S3 Connection Test
-        if st.button("☁️ Test S3 Connection", type="secondary"):
-            with st.spinner("Testing S3 connection..."):
-                s3_result = api.test_s3_connection()
+
+                s3_result = status["s3"]
                 if s3_result["status"] == "success":
                     st.success("✅ S3 connection OK!")
                 else:
@@ -368,6 +684,16 @@ def main():
         st.subheader("📊 Quick Status")
         if st.button("🔄 Refresh Status"):
             st.rerun()
+        if st.button("🧹 Clear Cached Data"):
+            st.cache_data.clear()
+            st.rerun()
+
+        # Cache tallies live in the S3 module; only render them once
+        # the explorer has actually pulled it in — don't pay its
+        # import just for an empty expander
+        s3_mod = sys.modules.get('s3_data_visualizer')
+        if s3_mod is not None:
+            s3_mod.render_cache_stats()
     
     # Main content tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -402,7 +728,7 @@ def main():
         if uploaded_files:
             st.success(f"✅ {len(uploaded_files)} file(s) selected:")
             for file in uploaded_files:
-                file_size = len(file.getvalue()) / 1024  # Size in KB
+                file_size = file.size / 1024  # Size in KB
                 st.write(f"- **{file.name}** ({file_size:.1f} KB)")
         
         # Role-specific messaging
@@ -422,17 +748,38 @@ def main():
                     st.info("📤 Uploading files...")
                     progress_bar = st.progress(0)
                     status_text = st.empty()
-                    
-                    # Update progress
-                    progress_bar.progress(25)
                     status_text.text("🔄 Processing files and starting analysis...")
-                    
-                    # Make the request without timeout
-                    result = api.upload_and_analyze(client_id, uploaded_files)
-                    
-                    # Update progress
-                    progress_bar.progress(100)
-                    status_text.text("✅ Analysis completed!")
+
+                    # Prefer the direct-to-S3 presigned upload; fall back
+                    # to proxying the bytes through the API when the
+                    # backend has no upload-session support
+                    result = api.upload_via_presigned(client_id, uploaded_files)
+                    if result is not None:
+                        stream_events = []
+                    else:
+                        result = {"status": "error", "error": "No response received"}
+                        stream_events = api.upload_and_analyze_stream(client_id, uploaded_files)
+
+                    # Stream the request (no timeout) and surface each
+                    # server-side progress event as it arrives
+                    for event in stream_events:
+                        if event["status"] == "progress":
+                            evt = event["data"]
+                            if isinstance(evt, dict):
+                                if "pct" in evt:
+                                    progress_bar.progress(min(100, int(evt["pct"])))
+                                if "msg" in evt:
+                                    status_text.text(evt["msg"])
+                        else:
+                            result = event
+
+                    # Only claim success when the result says so; the
+                    # error details follow via display_response
+                    if result.get("status") == "success":
+                        progress_bar.progress(100)
+                        status_text.text("✅ Analysis completed!")
+                    else:
+                        status_text.text("❌ Upload failed")
                 
                 # Clear progress and show results
                 progress_placeholder.empty()
@@ -488,10 +835,9 @@ def main():
             else:
                 st.warning("⚠️ Please enter a session ID.")
         
-        # Auto-refresh functionality
+        # Auto-refresh functionality (fragment reruns itself every 10s)
         if auto_refresh and session_id:
-            time.sleep(10)
-            st.rerun()
+            auto_refresh_status(api, session_id)
     
     # Tab 3: Client Dashboard
     with tab3:
@@ -518,7 +864,7 @@ def main():
         if st.button("📊 Load Dashboard", type="primary", disabled=not dashboard_client_id):
             if dashboard_client_id:
                 with st.spinner("Loading dashboard data..."):
-                    result = api.get_client_dashboard(dashboard_client_id)
+                    result = fetch_dashboard(API_BASE_URL, dashboard_client_id)
                     display_response(result, "Client Dashboard Data")
                     
                     # If successful, create comprehensive visualizations
@@ -532,8 +878,10 @@ def main():
         st.header("☁️ S3 Data Explorer & Visualizer")
         st.markdown("**Direct access to S3 bucket data with advanced visualizations**")
         
-        # Initialize S3 visualizer
+        # Initialize S3 visualizer (imported lazily: it pulls in
+        # boto3 and the plotly stack)
         if 's3_visualizer' not in st.session_state:
+            from s3_data_visualizer import S3DataVisualizer
             st.session_state.s3_visualizer = S3DataVisualizer()
         
         s3_viz = st.session_state.s3_visualizer
@@ -556,71 +904,7 @@ AWS_REGION=your-aws-region
                 s3_objects = s3_viz.list_s3_objects()
             
             if s3_objects:
-                st.subheader(f"📁 Available Data Files ({len(s3_objects)} files)")
-                
-                # Group objects by client ID
-                client_groups = {}
-                for obj in s3_objects:
-                    client_id = s3_viz.extract_client_id_from_key(obj)
-                    if client_id not in client_groups:
-                        client_groups[client_id] = []
-                    client_groups[client_id].append(obj)
-                
-                # Client selection
-                selected_client = st.selectbox(
-                    "👤 Select Client:",
-                    options=list(client_groups.keys()),
-                    help="Choose a client to visualize their data"
-                )
-                
-                if selected_client:
-                    client_files = client_groups[selected_client]
-                    
-                    # File selection
-                    selected_file = st.selectbox(
-                        "📄 Select Data File:",
-                        options=client_files,
-                        help="Choose a specific JSON file to visualize"
-                    )
-                    
-                    if selected_file:
-                        # Load and visualize button
-                        if st.button("🚀 Load & Visualize Data", type="primary"):
-                            with st.spinner(f"📊 Loading and analyzing {selected_file}..."):
-                                # Fetch data from S3
-                                json_data = s3_viz.fetch_json_from_s3(selected_file)
-                                
-                                if json_data:
-                                    st.success(f"✅ Successfully loaded {selected_file}")
-                                    
-                                    # Create comprehensive dashboard
-                                    s3_viz.create_comprehensive_dashboard(json_data, selected_client)
-                                else:
-                                    st.error("❌ Failed to load data from S3")
-                        
-                        # Show file info
-                        st.info(f"📋 **File:** `{selected_file}` | **Client:** `{selected_client}`")
-                
-                # Bulk analysis option
-                st.divider()
-                st.subheader("📊 Bulk Analysis")
-                
-                if st.button("📈 Analyze All Client Data", type="secondary"):
-                    with st.spinner("📊 Performing bulk analysis..."):
-                        # Analyze data for current user's client ID
-                        user_client_files = client_groups.get(get_current_client_id(), [])
-                        
-                        if user_client_files:
-                            for file in user_client_files[:3]:  # Limit to 3 files
-                                st.subheader(f"📄 Analysis: {file}")
-                                json_data = s3_viz.fetch_json_from_s3(file)
-                                if json_data:
-                                    # Create mini dashboard for each file
-                                    with st.expander(f"📊 {file} Dashboard", expanded=False):
-                                        s3_viz.create_comprehensive_dashboard(json_data, get_current_client_id())
-                        else:
-                            st.warning(f"No data files found for your client ID: {get_current_client_id()}")
-            
+                s3_explorer_fragment(s3_viz, s3_objects)
             else:
                 st.warning("📁 No JSON files found in the S3 bucket")
                 st.info("🔍 Make sure your S3 bucket contains JSON files with analysis results")
@@ -705,5 +989,14 @@ AWS_REGION=your-aws-region
         unsafe_allow_html=True
     )
 
+def main():
+    # Check authentication first
+    if not check_authentication():
+        show_login_page()
+        return
+
+    bootstrap()
+    render()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,20 @@
+"""Cached DataFrame helpers shared by the dashboard and the S3 explorer"""
+import io
+import pandas as pd
+import streamlit as st
+
+@st.cache_data(show_spinner=False)
+def to_csv(df: pd.DataFrame) -> bytes:
+    """CSV bytes for the download button, cached on the frame's hash"""
+    # Write through a text wrapper straight into bytes so the button
+    # gets raw bytes without an extra encode copy of the whole CSV
+    buf = io.BytesIO()
+    with io.TextIOWrapper(buf, encoding='utf-8', newline='') as writer:
+        df.to_csv(writer, index=False)
+        writer.flush()
+        return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+def joined_rows(df: pd.DataFrame) -> pd.Series:
+    """One search string per row, cached per frame for the text filter"""
+    return df.astype(str).agg(' '.join, axis=1)
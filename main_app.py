@@ -3,8 +3,8 @@
 Main Excel Analysis Application with Authentication
 """
 import streamlit as st
+import excel_analysis_ui
 from auth import check_authentication, show_login_page
-from excel_analysis_ui import main as excel_main
 
 def main():
     """Main application entry point"""
@@ -13,9 +13,11 @@ def main():
         # Show login page if not authenticated
         show_login_page()
     else:
-        # Show main Excel analysis dashboard if authenticated
-        excel_main()
+        # One-time session setup runs once; reruns only redraw widgets
+        if "_ui_bootstrapped" not in st.session_state:
+            excel_analysis_ui.bootstrap()
+            st.session_state._ui_bootstrapped = True
+        excel_analysis_ui.render()
 
 if __name__ == "__main__":
     main()
-
@@ -2,32 +2,85 @@
 """
 Launch script for Excel Analysis Dashboard
 """
-import subprocess
+import importlib.util
+import os
+import signal
+import socket
 import sys
+import webbrowser
+
+APP_PORT = 8501
+APP_URL = f"http://127.0.0.1:{APP_PORT}"
+PID_FILE = "/tmp/excel_analysis.pid"
+
+# Built once at import; no -S, since streamlit lives in site-packages
+# and skipping site initialization would drop it off sys.path
+_STREAMLIT_ARGV = (
+    sys.executable, "-m", "streamlit", "run", "main_app.py",
+    "--server.headless", "false",
+    "--server.port", str(APP_PORT),
+    "--browser.gatherUsageStats", "false",
+)
+
+def _app_running() -> bool:
+    """True when something is already listening on the app port"""
+    try:
+        with socket.create_connection(("127.0.0.1", APP_PORT), timeout=0.1):
+            return True
+    except OSError:
+        return False
+
+def _stop():
+    """Stop a previously launched dashboard via its pidfile"""
+    try:
+        with open(PID_FILE) as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        print("❌ No running dashboard found (missing or stale pidfile)")
+        sys.exit(1)
+
+    try:
+        os.kill(pid, signal.SIGTERM)
+        print(f"🛑 Stopped Excel Analysis Dashboard (pid {pid})")
+    except ProcessLookupError:
+        print(f"❌ No process with pid {pid}; removing stale pidfile")
+    os.unlink(PID_FILE)
 
 def main():
     """Launch the Excel Analysis Streamlit application"""
+    if "--stop" in sys.argv[1:]:
+        _stop()
+        return
+
     try:
-        # Check if streamlit is installed
-        subprocess.run([sys.executable, "-c", "import streamlit"], check=True, capture_output=True)
-        
+        # Check if streamlit is installed (in-process spec lookup; no
+        # need to pay a whole interpreter startup just to probe it)
+        if importlib.util.find_spec("streamlit") is None:
+            print("❌ Error: Streamlit is not installed.")
+            print("📦 Please install requirements: pip install -r requirements.txt")
+            sys.exit(1)
+
+        # Reuse an already-running instance instead of paying the full
+        # streamlit import cost on every launch
+        if _app_running():
+            print(f"♻️ Dashboard already running at {APP_URL} — opening browser")
+            webbrowser.open(APP_URL)
+            return
+
         # Launch the Streamlit app
         print("📊 Starting Excel Analysis Dashboard...")
         print("🔗 API Base URL: http://your-api-server:8006")
         print("📱 The app will open in your default browser")
         print("=" * 50)
-        
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", "main_app.py",
-            "--server.headless", "false",
-            "--server.port", "8501",
-            "--browser.gatherUsageStats", "false"
-        ])
-        
-    except subprocess.CalledProcessError:
-        print("❌ Error: Streamlit is not installed.")
-        print("📦 Please install requirements: pip install -r requirements.txt")
-        sys.exit(1)
+
+        # Replace this process with streamlit instead of parenting it:
+        # nothing runs after the launch, so keeping the launcher
+        # interpreter alive for the app's lifetime was pure overhead.
+        # Our pid stays valid through exec, so record it for --stop.
+        with open(PID_FILE, "w") as f:
+            f.write(str(os.getpid()))
+        os.execv(_STREAMLIT_ARGV[0], list(_STREAMLIT_ARGV))
+
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
     except Exception as e: